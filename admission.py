@@ -0,0 +1,163 @@
+import itertools
+import threading
+import time
+from bisect import insort
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+
+class Shed(Exception):
+    """Raised when a request is not admitted and should be answered degraded."""
+
+    def __init__(self, endpoint, reason):
+        super().__init__(f"{endpoint}: {reason}")
+        self.endpoint = endpoint
+        self.reason = reason
+
+
+@dataclass
+class EndpointLimit:
+    limit: int          # max concurrent LLM calls for this endpoint
+    max_queue: int      # max waiting requests before shedding
+    timeout: float      # max seconds a request may wait for a slot
+    deadline: float     # end-to-end budget (queue wait + backend call) in seconds
+
+
+class _Waiter:
+    __slots__ = ("key", "endpoint", "priority", "shed")
+
+    def __init__(self, key, endpoint, priority):
+        self.key = key
+        self.endpoint = endpoint
+        self.priority = priority
+        self.shed = None
+
+    def __lt__(self, other):
+        return self.key < other.key
+
+
+# -------------------------------
+# Admission Controller
+# -------------------------------
+class AdmissionController:
+    """Priority admission in front of a shared backend (the LLM).
+
+    Waiters are ordered by priority (higher first, FIFO within a priority).
+    A waiter is admitted once it is the best-ranked request whose endpoint is
+    under its own limit and the backend is under the global limit. Requests
+    that would overflow their endpoint queue, or wait past their deadline,
+    are shed so the caller can return a degraded answer immediately.
+    """
+
+    def __init__(self, global_limit, endpoints):
+        self.global_limit = global_limit
+        self.endpoints = endpoints
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._waiting = []
+        self._in_flight = {name: 0 for name in endpoints}
+        self._stats = {
+            name: {"admitted": 0, "shed_timeout": 0, "shed_overflow": 0,
+                   "peak_queue_depth": 0, "max_wait_ms": 0.0}
+            for name in endpoints
+        }
+
+    # ---------- Internals ----------
+    def _queue_depth(self, endpoint):
+        return sum(1 for w in self._waiting if w.endpoint == endpoint)
+
+    def _next_eligible(self):
+        if sum(self._in_flight.values()) >= self.global_limit:
+            return None
+        for w in self._waiting:
+            if self._in_flight[w.endpoint] < self.endpoints[w.endpoint].limit:
+                return w
+        return None
+
+    def _enqueue(self, endpoint, priority):
+        cfg = self.endpoints[endpoint]
+        waiter = _Waiter((-priority, next(self._seq)), endpoint, priority)
+
+        if self._queue_depth(endpoint) >= cfg.max_queue:
+            # Make room by evicting the lowest-ranked waiter, if the newcomer outranks it
+            worst = max((w for w in self._waiting if w.endpoint == endpoint), default=None)
+            if worst is None or worst.priority >= priority:
+                self._stats[endpoint]["shed_overflow"] += 1
+                raise Shed(endpoint, "queue full")
+            self._waiting.remove(worst)
+            worst.shed = "queue full"
+            self._stats[endpoint]["shed_overflow"] += 1
+            self._cond.notify_all()
+
+        insort(self._waiting, waiter)
+        stats = self._stats[endpoint]
+        stats["peak_queue_depth"] = max(stats["peak_queue_depth"], self._queue_depth(endpoint))
+        return waiter
+
+    def _acquire(self, endpoint, priority, start):
+        cfg = self.endpoints[endpoint]
+        deadline = start + min(cfg.timeout, cfg.deadline)
+
+        with self._cond:
+            waiter = self._enqueue(endpoint, priority)
+            while True:
+                if waiter.shed:
+                    raise Shed(endpoint, waiter.shed)
+
+                if self._next_eligible() is waiter:
+                    self._waiting.remove(waiter)
+                    self._in_flight[endpoint] += 1
+                    stats = self._stats[endpoint]
+                    stats["admitted"] += 1
+                    waited = (time.monotonic() - start) * 1000
+                    stats["max_wait_ms"] = max(stats["max_wait_ms"], round(waited, 1))
+                    # Another slot may still be free for the next waiter
+                    self._cond.notify_all()
+                    return
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._waiting.remove(waiter)
+                    self._stats[endpoint]["shed_timeout"] += 1
+                    self._cond.notify_all()
+                    raise Shed(endpoint, "deadline exceeded")
+
+                self._cond.wait(remaining)
+
+    def _release(self, endpoint):
+        with self._cond:
+            self._in_flight[endpoint] -= 1
+            self._cond.notify_all()
+
+    # ---------- Public ----------
+    @contextmanager
+    def admit(self, endpoint, priority=0):
+        """Hold one backend slot for `endpoint`; raises Shed if not admitted.
+
+        Yields the seconds left of the endpoint deadline, to be used as the
+        backend call's timeout so the whole request stays bounded.
+        """
+        start = time.monotonic()
+        self._acquire(endpoint, priority, start)
+        try:
+            yield self.endpoints[endpoint].deadline - (time.monotonic() - start)
+        finally:
+            self._release(endpoint)
+
+    def metrics(self):
+        with self._cond:
+            return {
+                "global_limit": self.global_limit,
+                "in_flight": sum(self._in_flight.values()),
+                "queue_depth": len(self._waiting),
+                "endpoints": {
+                    name: {
+                        "limit": cfg.limit,
+                        "in_flight": self._in_flight[name],
+                        "queue_depth": self._queue_depth(name),
+                        **self._stats[name],
+                        "shed": self._stats[name]["shed_timeout"] + self._stats[name]["shed_overflow"],
+                    }
+                    for name, cfg in self.endpoints.items()
+                },
+            }
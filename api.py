@@ -1,12 +1,6 @@
 import os
-import joblib
-import faiss
-import numpy as np
-from dotenv import load_dotenv
 from fastapi import FastAPI, UploadFile, File
 from pydantic import BaseModel
-from sentence_transformers import SentenceTransformer
-from groq import Groq
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -19,19 +13,44 @@ from reportlab.platypus import (
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 from datetime import datetime
+from groq import APIError
+from admission import AdmissionController, EndpointLimit, Shed
+from engine import SEVERITY_LEVELS, get_engine
+from sessions import SessionStore, format_history
+from static_frontend import mount_frontend
 
 
 # -------------------------------
-# Load Environment & Models
+# Load Shared Engine
 # -------------------------------
-load_dotenv()
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+engine = get_engine().warmup()
 
-severity_model = joblib.load("models/severity_model.pkl")
-embed_model = SentenceTransformer("all-MiniLM-L6-v2")
+# -------------------------------
+# LLM Admission Control
+# -------------------------------
+# Limits + queues stay below the default threadpool size (40) so waiting
+# requests never starve the non-LLM endpoints.
+admission = AdmissionController(
+    global_limit=8,
+    endpoints={
+        "analyze": EndpointLimit(limit=6, max_queue=16, timeout=8.0, deadline=15.0),
+        "followup": EndpointLimit(limit=4, max_queue=8, timeout=8.0, deadline=15.0),
+        "explain-report": EndpointLimit(limit=2, max_queue=4, timeout=5.0, deadline=30.0),
+    }
+)
+REPORT_PRIORITY = -1  # report explanations yield to every symptom query
 
-index = faiss.read_index("vector_db/medical_index.faiss")
-chunks = np.load("vector_db/chunks.npy", allow_pickle=True)
+# -------------------------------
+# Follow-up Sessions
+# -------------------------------
+# Set MEDAI_SESSION_DIR to persist sessions on local disk as well.
+# Multi-worker deployments must set it to a directory every worker shares:
+# the in-memory store is per process, so another worker would not find the session.
+sessions = SessionStore(
+    max_sessions=1000,
+    ttl=3600,
+    disk_dir=os.getenv("MEDAI_SESSION_DIR")
+)
 
 # -------------------------------
 # FastAPI App
@@ -46,6 +65,9 @@ app.add_middleware(
 
 )
 
+# Built frontend is served same-origin, so the browser skips CORS preflights
+mount_frontend(app)
+
 # -------------------------------
 # Request Schema
 # -------------------------------
@@ -53,9 +75,11 @@ class SymptomRequest(BaseModel):
     symptoms: str
 
 class FollowUpRequest(BaseModel):
-    base_response: str
-    severity_level: str
     user_question: str
+    session_id: str | None = None
+    # Legacy clients send the analysis back instead of a session_id
+    base_response: str | None = None
+    severity_level: str | None = None
 
 class ReportRequest(BaseModel):
     name: str
@@ -72,28 +96,26 @@ class ExplanationRequest(BaseModel):
 # Helper Functions
 # -------------------------------
 def rule_based_severity(text):
-    text = text.lower()
-    if any(x in text for x in ["chest pain", "shortness of breath", "seizure", "stroke"]):
-        return 2
-    if any(x in text for x in ["runny nose", "sneezing", "itching"]):
-        return 0
-    return None
-
-def predict_severity(text):
-    vec = embed_model.encode([text])
-    return severity_model.predict(vec)[0]
-
-def retrieve_chunks(query, k=3):
-    vec = embed_model.encode([query])
-    _, I = index.search(vec, k)
-    return [chunks[i] for i in I[0]]
-
-def call_llm(prompt):
-    response = client.chat.completions.create(
-        model="llama-3.1-8b-instant",
-        messages=[{"role": "user", "content": prompt}]
+    result = engine.match_rules(text)
+    return result.severity, result.audit()
+
+def generate_admitted(endpoint, priority, prompt):
+    """LLM answer, or None when the request is shed or Groq fails."""
+    try:
+        with admission.admit(endpoint, priority) as remaining:
+            if remaining <= 0:
+                return None
+            # No retries: a retry would outlive the deadline, the degraded answer won't
+            return engine.generate(prompt, timeout=remaining, max_retries=0)
+    except (Shed, APIError):
+        return None
+
+def retrieval_only_answer(docs):
+    return (
+        "The assistant is under heavy load, so here is the most relevant "
+        "reference information we found:\n\n"
+        + "\n\n".join(f"- {d}" for d in docs)
     )
-    return response.choices[0].message.content
 
 # -------------------------------
 # API Endpoint
@@ -102,12 +124,15 @@ def call_llm(prompt):
 def analyze_symptoms(request: SymptomRequest):
     user_input = request.symptoms
 
-    rule_sev = rule_based_severity(user_input)
-    sev = rule_sev if rule_sev is not None else predict_severity(user_input)
+    # One encoding shared by the classifier and the retriever
+    vec = engine.embed(user_input)
+
+    rule_sev, matched_rules = rule_based_severity(user_input)
+    sev = rule_sev if rule_sev is not None else engine.classify(vector=vec)
 
-    severity_label = {0: "Low", 1: "Moderate", 2: "High"}[sev]
+    severity_label = engine.severity_label(sev)
 
-    docs = retrieve_chunks(user_input)
+    docs = engine.retrieve(vector=vec)
     context = "\n".join(docs)
 
     prompt = f"""
@@ -127,23 +152,50 @@ Provide:
 3. Safe general advice
 """
 
-    explanation = call_llm(prompt)
+    explanation = generate_admitted("analyze", sev, prompt)
+    degraded = explanation is None
+    if degraded:
+        explanation = retrieval_only_answer(docs)
+
+    session_id = sessions.create(user_input, severity_label, explanation, docs)
 
     return {
+        "session_id": session_id,
         "severity_level": severity_label,
         "response": explanation,
+        "degraded": degraded,
+        "matched_rules": matched_rules,
         "disclaimer": "Educational use only. Consult a healthcare professional."
     }
 
 @app.post("/followup")
 def follow_up(request: FollowUpRequest):
+    session = sessions.get(request.session_id) if request.session_id else None
+
+    if session is not None:
+        severity_level = session["severity_level"]
+        base_response = session["analysis"]
+        history = format_history(session["turns"])
+    elif request.base_response and request.severity_level:
+        severity_level = request.severity_level
+        base_response = request.base_response
+        history = ""
+    else:
+        return {
+            "answer": "Your session has expired. Please analyze your symptoms again.",
+            "session_expired": True,
+            "disclaimer": "This response is for educational purposes only."
+        }
+
+    history_block = f"\nConversation So Far:\n{history}\n" if history else ""
+
     prompt = f"""
 You are a healthcare assistant chatbot.
 
 Base Medical Analysis:
-Severity Level: {request.severity_level}
-{request.base_response}
-
+Severity Level: {severity_level}
+{base_response}
+{history_block}
 User Question:
 {request.user_question}
 
@@ -155,13 +207,26 @@ Rules:
 - Keep response simple and safe
 """
 
-    answer = call_llm(prompt)
+    priority = SEVERITY_LEVELS.get(severity_level, 1)
+    answer = generate_admitted("followup", priority, prompt)
+    degraded = answer is None
+    if degraded:
+        # Reuse the analysis context instead of another retrieval
+        docs = session["context"] if session else engine.retrieve(request.user_question)
+        answer = retrieval_only_answer(docs)
+    elif session is not None:
+        sessions.add_turn(request.session_id, request.user_question, answer)
 
     return {
         "answer": answer,
+        "degraded": degraded,
         "disclaimer": "This response is for educational purposes only."
     }
 
+@app.get("/metrics")
+def metrics():
+    return admission.metrics()
+
 @app.post("/download-report")
 def download_report(request: ReportRequest):
 
@@ -317,7 +382,13 @@ Medical Report:
 {text[:4000]}
 """
 
-        explanation = call_llm(prompt)
+        explanation = generate_admitted("explain-report", REPORT_PRIORITY, prompt)
+        if explanation is None:
+            return {
+                "explanation": "The assistant is under heavy load. Please try explaining this report again in a moment.",
+                "degraded": True,
+                "disclaimer": "Educational use only."
+            }
 
         return {
             "explanation": explanation,
@@ -0,0 +1,70 @@
+import argparse
+import os
+import re
+import tempfile
+import time
+
+import pandas as pd
+
+from preprocess import RAW_PATH, load_stopwords, preprocess, severity_map
+
+# -------------------------------
+# Legacy per-row pipeline (baseline)
+# -------------------------------
+def legacy_preprocess(raw_path, stop_words):
+    df = pd.read_csv(raw_path)
+    df = df.drop(columns=["Unnamed: 0"])
+
+    def clean_text(text):
+        text = text.lower()
+        text = re.sub(r'[^a-zA-Z ]', '', text)
+        words = text.split()
+        words = [w for w in words if w not in stop_words]
+        return " ".join(words)
+
+    df["clean_text"] = df["text"].apply(clean_text)
+    df["severity"] = df["label"].apply(lambda d: severity_map.get(d, 1))
+    return df[["clean_text", "severity"]]
+
+# -------------------------------
+# Synthetic Dataset
+# -------------------------------
+def make_dataset(rows, path):
+    base = pd.read_csv(RAW_PATH)
+    repeats = -(-rows // len(base))
+    big = pd.concat([base] * repeats, ignore_index=True).iloc[:rows]
+    big["Unnamed: 0"] = range(len(big))
+    big.to_csv(path, index=False)
+
+def report(name, rows, elapsed):
+    print(f"{name:<24} {rows:>10,} rows  {elapsed:>8.2f}s  {rows / elapsed:>12,.0f} rows/sec")
+
+# -------------------------------
+# MAIN
+# -------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark symptom preprocessing throughput")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    stop_words = load_stopwords()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raw = os.path.join(tmp, "raw.csv")
+        out = os.path.join(tmp, "out.parquet")
+        make_dataset(args.rows, raw)
+
+        if not args.skip_legacy:
+            start = time.perf_counter()
+            legacy_preprocess(raw, stop_words)
+            report("legacy (df.apply)", args.rows, time.perf_counter() - start)
+
+        rows, elapsed = preprocess(raw, out, args.chunksize, 1, stop_words)
+        report("vectorized, 1 worker", rows, elapsed)
+
+        if args.workers > 1:
+            rows, elapsed = preprocess(raw, out, args.chunksize, args.workers, stop_words)
+            report(f"vectorized, {args.workers} workers", rows, elapsed)
@@ -0,0 +1,113 @@
+import argparse
+import multiprocessing as mp
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from engine import EngineConfig, MedicalEngine, ServiceConfig
+
+QUERIES = [
+    "chest pain and breathing difficulty",
+    "high fever with chills and body ache",
+    "persistent dry cough at night",
+    "severe headache with sensitivity to light",
+    "frequent urination and excessive thirst",
+    "wheezing and tight chest after exercise",
+]
+
+# -------------------------------
+# Helpers
+# -------------------------------
+def rss_mb(pid="self"):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+def wait_for_socket(path, timeout=300):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+                s.connect(path)
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError(f"retrieval service did not start on {path}")
+
+# -------------------------------
+# Worker (one per simulated uvicorn worker)
+# -------------------------------
+def worker(socket_path, rounds, start, results):
+    t0 = time.perf_counter()
+    engine = MedicalEngine(EngineConfig(service=ServiceConfig(socket_path=socket_path)))
+    if socket_path:
+        engine.retrieve(QUERIES[0])
+    else:
+        engine.embed_model
+        engine.index
+    cold_start = time.perf_counter() - t0
+
+    # All workers start querying together to exercise contention/batching
+    start.wait()
+    latencies = []
+    for _ in range(rounds):
+        for query in QUERIES:
+            t = time.perf_counter()
+            engine.retrieve(query)
+            latencies.append((time.perf_counter() - t) * 1000)
+
+    results.put((cold_start, latencies, rss_mb()))
+
+def run(mode, workers, rounds, socket_path):
+    ctx = mp.get_context("spawn")
+    start = ctx.Barrier(workers)
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(target=worker, args=(socket_path if mode == "shared" else None, rounds, start, results))
+        for _ in range(workers)
+    ]
+    for p in procs:
+        p.start()
+    collected = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+
+    latencies = np.concatenate([np.array(r[1]) for r in collected])
+    return {
+        "cold_start": float(np.mean([r[0] for r in collected])),
+        "p50": float(np.percentile(latencies, 50)),
+        "p95": float(np.percentile(latencies, 95)),
+        "worker_rss": sum(r[2] for r in collected),
+    }
+
+# -------------------------------
+# MAIN
+# -------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="In-process vs shared retrieval service")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--socket", default="/tmp/medai-retrieval-bench.sock")
+    args = parser.parse_args()
+
+    service = subprocess.Popen([sys.executable, "retrieval_service.py", "--socket", args.socket])
+    try:
+        wait_for_socket(args.socket)
+
+        print(f"{'mode':<10}{'workers':>8}{'cold start':>12}{'p50 ms':>10}{'p95 ms':>10}{'total RSS MB':>15}")
+        for n in args.workers:
+            for mode in ("inproc", "shared"):
+                r = run(mode, n, args.rounds, args.socket)
+                total = r["worker_rss"] + (rss_mb(service.pid) if mode == "shared" else 0)
+                print(f"{mode:<10}{n:>8}{r['cold_start']:>11.2f}s{r['p50']:>10.2f}{r['p95']:>10.2f}{total:>15.0f}")
+    finally:
+        service.terminate()
+        service.wait()
+        if os.path.exists(args.socket):
+            os.remove(args.socket)
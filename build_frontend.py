@@ -0,0 +1,124 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+
+SRC = "frontend"
+DIST = "frontend/dist"
+BG_MAX_WIDTH = 1600
+BG_QUALITY = 75
+COMPRESSIBLE = (".html", ".css", ".js", ".json", ".svg")
+
+# -------------------------------
+# Minifiers (conservative: whitespace and comments only)
+# -------------------------------
+def minify_css(css):
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{}:;,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+def minify_js(js):
+    # Newlines are kept so automatic semicolon insertion still works
+    js = re.sub(r"^\s*/\*.*?\*/\s*$", "", js, flags=re.S | re.M)
+    lines = (line.strip() for line in js.splitlines())
+    return "\n".join(l for l in lines if l and not l.startswith("//"))
+
+def minify_html(html):
+    html = re.sub(r"<!--.*?-->", "", html, flags=re.S)
+    lines = (line.strip() for line in html.splitlines())
+    return "\n".join(l for l in lines if l)
+
+# -------------------------------
+# Helpers
+# -------------------------------
+def hashed_name(name, data):
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:10]}{ext}"
+
+def write_asset(name, data):
+    final = hashed_name(name, data)
+    with open(os.path.join(DIST, "assets", final), "wb") as f:
+        f.write(data)
+    return final
+
+def background_image():
+    src = os.path.join(SRC, "assets", "bg.jpg")
+    try:
+        from io import BytesIO
+        from PIL import Image
+    except ImportError:
+        print("Pillow not installed, shipping bg.jpg unchanged")
+        with open(src, "rb") as f:
+            return "bg.jpg", f.read()
+
+    img = Image.open(src).convert("RGB")
+    if img.width > BG_MAX_WIDTH:
+        img = img.resize((BG_MAX_WIDTH, round(img.height * BG_MAX_WIDTH / img.width)), Image.LANCZOS)
+    buf = BytesIO()
+    img.save(buf, "WEBP", quality=BG_QUALITY, method=6)
+    return "bg.webp", buf.getvalue()
+
+def precompress(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path + ".gz", "wb") as f:
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    try:
+        import brotli
+    except ImportError:
+        return
+    with open(path + ".br", "wb") as f:
+        f.write(brotli.compress(data, quality=11))
+
+# -------------------------------
+# Build
+# -------------------------------
+def build():
+    shutil.rmtree(DIST, ignore_errors=True)
+    os.makedirs(os.path.join(DIST, "assets"))
+    manifest = {}
+
+    # Background image -> referenced from the CSS
+    bg_name, bg_data = background_image()
+    manifest["assets/bg.jpg"] = "assets/" + write_asset(bg_name, bg_data)
+
+    with open(os.path.join(SRC, "styles.css"), encoding="utf-8") as f:
+        css = f.read().replace("assets/bg.jpg", manifest["assets/bg.jpg"].split("/", 1)[1])
+    manifest["styles.css"] = "assets/" + write_asset("styles.css", minify_css(css).encode())
+
+    with open(os.path.join(SRC, "script.js"), encoding="utf-8") as f:
+        js = f.read()
+    manifest["script.js"] = "assets/" + write_asset("script.js", minify_js(js).encode())
+
+    # index.html is not hashed: it is revalidated and points at the hashed files
+    with open(os.path.join(SRC, "index.html"), encoding="utf-8") as f:
+        html = f.read()
+    html = html.replace('href="styles.css"', f'href="/{manifest["styles.css"]}"')
+    html = html.replace('src="script.js"', f'src="/{manifest["script.js"]}"')
+    with open(os.path.join(DIST, "index.html"), "w", encoding="utf-8") as f:
+        f.write(minify_html(html))
+
+    with open(os.path.join(DIST, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    for root, _, files in os.walk(DIST):
+        for name in files:
+            if name.endswith(COMPRESSIBLE):
+                precompress(os.path.join(root, name))
+
+    return manifest
+
+# -------------------------------
+# MAIN
+# -------------------------------
+if __name__ == "__main__":
+    manifest = build()
+
+    print("Frontend built:", DIST)
+    for root, _, files in os.walk(DIST):
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            print(f"  {os.path.relpath(path, DIST):<40} {os.path.getsize(path):>9,} bytes")
@@ -1,6 +1,6 @@
 import faiss
 import numpy as np
-from sentence_transformers import SentenceTransformer
+from embedding_cache import EmbeddingCache
 
 # Load chunks
 chunks = []
@@ -10,11 +10,11 @@ with open("data/processed/chunks.txt", encoding="utf-8") as f:
 
 print("Chunks loaded:", len(chunks))
 
-# Load embedding model
-model = SentenceTransformer("all-MiniLM-L6-v2")
+# Load embedding cache (unchanged chunks are never re-encoded)
+cache = EmbeddingCache("all-MiniLM-L6-v2")
 
 # Convert text to vectors
-embeddings = model.encode(chunks, show_progress_bar=True)
+embeddings = cache.encode(chunks, show_progress_bar=True)
 
 # Create FAISS index
 dim = embeddings.shape[1]
@@ -0,0 +1,166 @@
+import fcntl
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+
+import numpy as np
+
+# -------------------------------
+# Persistent Embedding Cache
+# -------------------------------
+# Layout (one directory per embedding model):
+#   lock         -> flock'd across load/append so concurrent runs don't clobber each other
+#   meta.json    -> {"model": ..., "dim": ...}
+#   keys.bin     -> 20-byte sha1 digest per row (append-only)
+#   vectors.f32  -> float32 matrix, one row per key (append-only)
+
+CACHE_DIR = "data/cache/embeddings"
+DIGEST_SIZE = 20
+
+
+def text_digest(text):
+    return hashlib.sha1(text.encode("utf-8")).digest()
+
+
+class EmbeddingCache:
+    def __init__(self, model_name="all-MiniLM-L6-v2", cache_dir=CACHE_DIR, model=None):
+        self.model_name = model_name
+        self.path = os.path.join(cache_dir, model_name.replace("/", "__"))
+        self._model = model
+        self._rows = {}
+        self._n = 0
+        self._dim = None
+        self._matrix = None
+
+        os.makedirs(self.path, exist_ok=True)
+        with self._locked(fcntl.LOCK_SH):
+            self._load()
+
+    # -------------------------------
+    # Storage
+    # -------------------------------
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    @contextmanager
+    def _locked(self, mode=fcntl.LOCK_EX):
+        # embeddings.py and build_vector_db.py may run at the same time on one cache
+        with open(self._file("lock"), "a") as f:
+            fcntl.flock(f, mode)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _size(self, name):
+        try:
+            return os.path.getsize(self._file(name))
+        except FileNotFoundError:
+            return 0
+
+    def _load(self):
+        # meta.json is only written once data is on disk; without it nothing is trusted
+        if not os.path.exists(self._file("meta.json")):
+            return
+
+        with open(self._file("meta.json"), encoding="utf-8") as f:
+            self._dim = json.load(f)["dim"]
+
+        try:
+            with open(self._file("keys.bin"), "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            raw = b""
+
+        # Only trust rows that made it into both files (a run may have been killed mid-append)
+        n_keys = len(raw) // DIGEST_SIZE
+        n_vecs = self._size("vectors.f32") // (4 * self._dim)
+        self._n = min(n_keys, n_vecs)
+
+        self._rows = {
+            raw[i * DIGEST_SIZE:(i + 1) * DIGEST_SIZE]: i
+            for i in range(self._n)
+        }
+
+    def _vectors(self):
+        if self._matrix is None or self._matrix.shape[0] != self._n:
+            self._matrix = np.memmap(
+                self._file("vectors.f32"), dtype=np.float32, mode="r", shape=(self._n, self._dim)
+            )
+        return self._matrix
+
+    def _append(self, keys, vectors):
+        with self._locked():
+            # Another process may have appended since we loaded: re-read the real end of file
+            self._load()
+
+            fresh = [i for i, key in enumerate(keys) if key not in self._rows]
+            if not fresh:
+                return
+            keys = [keys[i] for i in fresh]
+            vectors = vectors[fresh]
+
+            if self._dim is None:
+                self._dim = vectors.shape[1]
+            elif vectors.shape[1] != self._dim:
+                raise ValueError(f"embedding dim {vectors.shape[1]} != cached dim {self._dim}")
+
+            start = self._n
+
+            # Vectors first, then keys: a key on disk always has its vector behind it.
+            # Truncating drops only a torn tail; the lock keeps other writers out.
+            with open(self._file("vectors.f32"), "ab") as f:
+                f.truncate(start * 4 * self._dim)
+                f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+            with open(self._file("keys.bin"), "ab") as f:
+                f.truncate(start * DIGEST_SIZE)
+                f.write(b"".join(keys))
+
+            if not os.path.exists(self._file("meta.json")):
+                tmp = self._file("meta.json.tmp")
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump({"model": self.model_name, "dim": self._dim}, f)
+                os.replace(tmp, self._file("meta.json"))
+
+            for i, key in enumerate(keys):
+                self._rows[key] = start + i
+            self._n = start + len(keys)
+
+    # -------------------------------
+    # Encoding
+    # -------------------------------
+    @property
+    def model(self):
+        # Only load the model when something actually needs encoding
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    def __len__(self):
+        return len(self._rows)
+
+    def encode(self, texts, show_progress_bar=False):
+        keys = [text_digest(t) for t in texts]
+
+        # Unique, not-yet-cached texts in first-seen order
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in self._rows and key not in missing:
+                missing[key] = text
+
+        print(f"Embedding cache: {len(texts)} texts, {len(missing)} to encode")
+
+        if missing:
+            vectors = self.model.encode(
+                list(missing.values()),
+                show_progress_bar=show_progress_bar
+            )
+            self._append(list(missing), np.asarray(vectors, dtype=np.float32))
+
+        if not keys:
+            return np.empty((0, self._dim or 0), dtype=np.float32)
+
+        rows = np.fromiter((self._rows[k] for k in keys), dtype=np.int64, count=len(keys))
+        return np.asarray(self._vectors()[rows])
@@ -7,11 +7,12 @@ labels = df["severity"].tolist()
 
 print("Samples:", len(texts))
 
-from sentence_transformers import SentenceTransformer
+from embedding_cache import EmbeddingCache
 
-model = SentenceTransformer("all-MiniLM-L6-v2")
+# Balanced dataset is upsampled with replacement -> duplicates are encoded once
+cache = EmbeddingCache("all-MiniLM-L6-v2")
 
-embeddings = model.encode(
+embeddings = cache.encode(
     texts,
     show_progress_bar=True
 )
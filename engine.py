@@ -0,0 +1,218 @@
+import os
+import threading
+from dataclasses import dataclass, field
+
+import numpy as np
+from dotenv import load_dotenv
+
+SEVERITY_LABELS = {0: "Low", 1: "Moderate", 2: "High"}
+SEVERITY_LEVELS = {label: sev for sev, label in SEVERITY_LABELS.items()}
+
+# -------------------------------
+# Per-Stage Config
+# -------------------------------
+@dataclass
+class EmbedConfig:
+    model_name: str = "all-MiniLM-L6-v2"
+
+@dataclass
+class ClassifyConfig:
+    model_path: str = "models/severity_model.pkl"
+
+@dataclass
+class RulesConfig:
+    path: str = "data/rules/severity_rules.json"
+    reload_interval: float = 2.0
+
+@dataclass
+class RetrieveConfig:
+    index_path: str = "vector_db/medical_index.faiss"
+    chunks_path: str = "vector_db/chunks.npy"
+    k: int = 3
+
+@dataclass
+class ServiceConfig:
+    # Unix socket of a shared retrieval_service.py; unset = load models in-process
+    socket_path: str | None = field(default_factory=lambda: os.getenv("MEDAI_RETRIEVAL_SOCKET"))
+    timeout: float = 10.0     # per-call socket timeout; a hung service fails the call
+
+@dataclass
+class GenerateConfig:
+    model: str = "llama-3.1-8b-instant"
+    api_key_env: str = "GROQ_API_KEY"
+    timeout: float = 20.0     # bound a single slow Groq call
+    max_retries: int = 1
+
+@dataclass
+class EngineConfig:
+    embed: EmbedConfig = field(default_factory=EmbedConfig)
+    classify: ClassifyConfig = field(default_factory=ClassifyConfig)
+    rules: RulesConfig = field(default_factory=RulesConfig)
+    retrieve: RetrieveConfig = field(default_factory=RetrieveConfig)
+    service: ServiceConfig = field(default_factory=ServiceConfig)
+    generate: GenerateConfig = field(default_factory=GenerateConfig)
+
+# -------------------------------
+# Engine
+# -------------------------------
+class MedicalEngine:
+    """Shared embed / classify / retrieve / generate stages.
+
+    Each component is loaded on first use, so a script that only retrieves
+    never pays for the severity classifier or the Groq client.
+    """
+
+    def __init__(self, config=None):
+        self.config = config or EngineConfig()
+        self._lock = threading.Lock()
+        self._embed_model = None
+        self._severity_model = None
+        self._rules = None
+        self._index = None
+        self._chunks = None
+        self._client = None
+        self._service = None
+
+    # ---------- Components ----------
+    @property
+    def embed_model(self):
+        if self._embed_model is None:
+            with self._lock:
+                if self._embed_model is None:
+                    from sentence_transformers import SentenceTransformer
+                    self._embed_model = SentenceTransformer(self.config.embed.model_name)
+        return self._embed_model
+
+    @property
+    def severity_model(self):
+        if self._severity_model is None:
+            with self._lock:
+                if self._severity_model is None:
+                    import joblib
+                    self._severity_model = joblib.load(self.config.classify.model_path)
+        return self._severity_model
+
+    @property
+    def rules(self):
+        if self._rules is None:
+            with self._lock:
+                if self._rules is None:
+                    from rule_engine import RuleEngine
+                    self._rules = RuleEngine(
+                        self.config.rules.path, self.config.rules.reload_interval
+                    )
+        return self._rules
+
+    @property
+    def index(self):
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    import faiss
+                    self._chunks = np.load(self.config.retrieve.chunks_path, allow_pickle=True)
+                    self._index = faiss.read_index(self.config.retrieve.index_path)
+        return self._index
+
+    @property
+    def chunks(self):
+        self.index
+        return self._chunks
+
+    @property
+    def service(self):
+        # Client for the shared retrieval service, or None in in-process mode
+        if self._service is None and self.config.service.socket_path:
+            with self._lock:
+                if self._service is None:
+                    from retrieval_service import RetrievalClient
+                    self._service = RetrievalClient(
+                        self.config.service.socket_path, self.config.service.timeout
+                    )
+        return self._service
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from groq import Groq
+                    load_dotenv()
+                    cfg = self.config.generate
+                    self._client = Groq(
+                        api_key=os.getenv(cfg.api_key_env),
+                        timeout=cfg.timeout,
+                        max_retries=cfg.max_retries
+                    )
+        return self._client
+
+    def warmup(self):
+        if self.service is None:
+            self.embed_model
+            self.index
+        self.severity_model
+        self.rules
+        self.client
+        return self
+
+    # ---------- Stages ----------
+    def embed(self, texts):
+        if isinstance(texts, str):
+            texts = [texts]
+        if self.service is not None:
+            return self.service.embed(texts)
+        return np.asarray(self.embed_model.encode(texts), dtype=np.float32)
+
+    def classify(self, text=None, vector=None):
+        # Pass `vector` from embed() to reuse one encoding across stages
+        if vector is None:
+            vector = self.embed(text)
+        return int(self.severity_model.predict(vector)[0])
+
+    def match_rules(self, text):
+        # Red-flag rules; severity is None when no (non-negated) rule fires
+        return self.rules.evaluate(text)
+
+    def retrieve(self, query=None, k=None, vector=None):
+        k = k or self.config.retrieve.k
+        if self.service is not None:
+            if vector is None:
+                return self.service.search([query], k)[1][0]
+            return self.service.search_vectors(vector, k)[0]
+
+        if vector is None:
+            vector = self.embed(query)
+        _, I = self.index.search(vector, k)
+        return [self.chunks[i] for i in I[0]]
+
+    def generate(self, prompt, timeout=None, max_retries=None):
+        # Per-call overrides let callers fit the call into their own deadline
+        client = self.client
+        if timeout is not None or max_retries is not None:
+            client = client.with_options(
+                timeout=timeout if timeout is not None else self.config.generate.timeout,
+                max_retries=max_retries if max_retries is not None else self.config.generate.max_retries
+            )
+        response = client.chat.completions.create(
+            model=self.config.generate.model,
+            messages=[{"role": "user", "content": prompt}]
+        )
+        return response.choices[0].message.content
+
+    @staticmethod
+    def severity_label(sev):
+        return SEVERITY_LABELS[sev]
+
+# -------------------------------
+# Process-wide Instance
+# -------------------------------
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_engine(config=None):
+    """Return the process-wide engine, creating it on first call."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = MedicalEngine(config)
+    return _engine
@@ -1,5 +1,6 @@
 let severityLevel = "";
 let baseResponse = "";
+let sessionId = "";
 let uploadedExplanation = "";
 
 let analysisHTML = "";
@@ -9,7 +10,7 @@ let reportHTML = "";
 async function analyze() {
     const symptoms = document.getElementById("symptoms").value;
 
-    const res = await fetch("http://127.0.0.1:8000/analyze", {
+    const res = await fetch("/analyze", {
         method: "POST",
         headers: {"Content-Type": "application/json"},
         body: JSON.stringify({ symptoms })
@@ -19,6 +20,7 @@ async function analyze() {
 
     severityLevel = data.severity_level;
     baseResponse = data.response;
+    sessionId = data.session_id;
 
     analysisHTML = `
     <div class="result-card" id="analysisCard">
@@ -62,7 +64,7 @@ async function uploadReport() {
     const formData = new FormData();
     formData.append("file", file);
 
-    const res = await fetch("http://127.0.0.1:8000/explain-report", {
+    const res = await fetch("/explain-report", {
         method: "POST",
         body: formData
     });
@@ -102,6 +104,15 @@ function toggleChat() {
         chatWindow.style.display === "flex" ? "none" : "flex";
 }
 
+async function postFollowUp(body) {
+    const res = await fetch("/followup", {
+        method: "POST",
+        headers: {"Content-Type": "application/json"},
+        body: JSON.stringify(body)
+    });
+    return res.json();
+}
+
 async function sendFloatingMessage() {
     const input = document.getElementById("floatingInput");
     const message = input.value.trim();
@@ -125,17 +136,19 @@ async function sendFloatingMessage() {
         return;
     }
 
-    const res = await fetch("http://127.0.0.1:8000/followup", {
-        method: "POST",
-        headers: {"Content-Type": "application/json"},
-        body: JSON.stringify({
+    let data = await postFollowUp({
+        session_id: sessionId,
+        user_question: message
+    });
+
+    // Session lost server-side (restart, expiry, another worker): resend the analysis
+    if (data.session_expired) {
+        data = await postFollowUp({
             base_response: baseResponse,
             severity_level: severityLevel,
             user_question: message
-        })
-    });
-
-    const data = await res.json();
+        });
+    }
 
     chatBox.innerHTML += `
         <div class="chat-bubble bot-bubble">${data.answer}</div>
@@ -155,7 +168,7 @@ async function downloadReport() {
         return;
     }
 
-    const res = await fetch("http://127.0.0.1:8000/download-report", {
+    const res = await fetch("/download-report", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({
@@ -179,7 +192,7 @@ async function downloadReport() {
 
 
 async function downloadExplainedReport() {
-    const res = await fetch("http://127.0.0.1:8000/download-explained-report", {
+    const res = await fetch("/download-explained-report", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({
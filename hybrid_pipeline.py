@@ -1,76 +1,24 @@
-import os
-import joblib
-import faiss
-import numpy as np
-from dotenv import load_dotenv
-from sentence_transformers import SentenceTransformer
-from groq import Groq
+from engine import get_engine
 
 # -------------------------------
-# Load Environment
+# Load Shared Engine
 # -------------------------------
-load_dotenv()
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-
-# -------------------------------
-# Load Models
-# -------------------------------
-
-# Severity classifier
-severity_model = joblib.load("models/severity_model.pkl")
-
-# Embedding model (same as training)
-embed_model = SentenceTransformer("all-MiniLM-L6-v2")
-
-# Vector DB
-index = faiss.read_index("vector_db/medical_index.faiss")
-chunks = np.load("vector_db/chunks.npy", allow_pickle=True)
-
-# -------------------------------
-# Severity Prediction
-# -------------------------------
-
-def predict_severity(text):
-    vec = embed_model.encode([text])
-    severity = severity_model.predict(vec)[0]
-    return severity
-
-def severity_label(sev):
-    return {0: "Low", 1: "Moderate", 2: "High"}[sev]
-
-# -------------------------------
-# RAG Retrieval
-# -------------------------------
-
-def retrieve_chunks(query, k=3):
-    vec = embed_model.encode([query])
-    D, I = index.search(vec, k)
-    return [chunks[i] for i in I[0]]
-
-# -------------------------------
-# Groq LLM Call
-# -------------------------------
-
-def call_llm(prompt):
-    response = client.chat.completions.create(
-        model="llama-3.1-8b-instant",
-        messages=[
-            {"role": "user", "content": prompt}
-        ]
-    )
-    return response.choices[0].message.content
+engine = get_engine()
 
 # -------------------------------
 # HYBRID PIPELINE
 # -------------------------------
 
 def analyze_symptoms(user_input):
+    # One encoding shared by both stages
+    vec = engine.embed(user_input)
+
     # 1. Severity prediction
-    sev = predict_severity(user_input)
-    sev_text = severity_label(sev)
+    sev = engine.classify(vector=vec)
+    sev_text = engine.severity_label(sev)
 
     # 2. RAG explanation
-    docs = retrieve_chunks(user_input)
+    docs = engine.retrieve(vector=vec)
     context = "\n".join(docs)
 
     prompt = f"""
@@ -92,7 +40,7 @@ Provide:
 3. Safe general advice
 """
 
-    explanation = call_llm(prompt)
+    explanation = engine.generate(prompt)
 
     return {
         "severity_level": sev_text,
@@ -1,25 +1,18 @@
-import pandas as pd
-import re
-import nltk
-from nltk.corpus import stopwords
-
-nltk.download("stopwords")
-
-df = pd.read_csv("data/raw/symptom_disease.csv")
+import argparse
+import os
+import time
+from collections import deque
+from multiprocessing import Pool
 
-# Remove useless column
-df = df.drop(columns=["Unnamed: 0"])
-
-stop_words = set(stopwords.words("english"))
-
-def clean_text(text):
-    text = text.lower()
-    text = re.sub(r'[^a-zA-Z ]', '', text)
-    words = text.split()
-    words = [w for w in words if w not in stop_words]
-    return " ".join(words)
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
-df["clean_text"] = df["text"].apply(clean_text)
+RAW_PATH = "data/raw/symptom_disease.csv"
+OUT_PATH = "data/processed/severity_dataset.parquet"
+CHUNK_SIZE = 100_000
 
 severity_map = {
  "Heart attack":2,
@@ -36,17 +29,125 @@ severity_map = {
  "Allergy":0,
  "Acne":0
 }
+DEFAULT_SEVERITY = 1  # default moderate
+
+# -------------------------------
+# Stopwords
+# -------------------------------
+def load_stopwords():
+    import nltk
+    from nltk.corpus import stopwords
+
+    nltk.download("stopwords", quiet=True)
+    return set(stopwords.words("english"))
+
+# -------------------------------
+# Vectorized Cleaning
+# -------------------------------
+def clean_text(texts, stop_words):
+    # Whole-column Arrow kernels instead of a per-row Python function
+    arr = pa.array(texts.fillna("").astype(str), type=pa.string())
+    arr = pc.utf8_lower(arr)
+    arr = pc.replace_substring_regex(arr, r"[^a-z ]+", "")
+
+    # Tokenize, drop stopwords (and the empty tokens left by repeated spaces), re-join
+    tokens = pc.split_pattern(arr, " ")
+    words = pc.list_flatten(tokens)
+    parents = pc.list_parent_indices(tokens)
+
+    keep = pc.invert(pc.is_in(words, value_set=pa.array(sorted(set(stop_words) | {""}))))
+    counts = np.bincount(parents.filter(keep).to_numpy(), minlength=len(arr))
+    offsets = np.zeros(len(arr) + 1, dtype=np.int32)
+    np.cumsum(counts, out=offsets[1:])
+
+    kept = pa.ListArray.from_arrays(pa.array(offsets), words.filter(keep))
+    cleaned = pc.binary_join(kept, " ")
+    return cleaned.to_pandas().set_axis(texts.index)
+
+def map_severity(labels):
+    # Map each distinct label once, then broadcast through the category codes
+    labels = labels.astype("category")
+    lookup = np.array(
+        [severity_map.get(c, DEFAULT_SEVERITY) for c in labels.cat.categories]
+        + [DEFAULT_SEVERITY],  # code -1 (missing label) lands here
+        dtype=np.int8
+    )
+    return pd.Series(lookup[labels.cat.codes.to_numpy()], index=labels.index)
+
+def process_chunk(chunk, stop_words):
+    return pd.DataFrame({
+        "clean_text": clean_text(chunk["text"], stop_words),
+        "severity": map_severity(chunk["label"])
+    })
+
+# -------------------------------
+# Worker Pool
+# -------------------------------
+_stop_words = None
+
+def _init_worker(stop_words):
+    global _stop_words
+    _stop_words = stop_words
+
+def _process_in_worker(chunk):
+    return process_chunk(chunk, _stop_words)
+
+def _chunk_results(reader, stop_words, workers):
+    if workers <= 1:
+        for chunk in reader:
+            yield process_chunk(chunk, stop_words)
+        return
+
+    # Bounded window of in-flight chunks so the CSV is never fully read ahead
+    with Pool(workers, initializer=_init_worker, initargs=(stop_words,)) as pool:
+        pending = deque()
+        for chunk in reader:
+            pending.append(pool.apply_async(_process_in_worker, (chunk,)))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+# -------------------------------
+# Pipeline
+# -------------------------------
+def preprocess(raw_path=RAW_PATH, out_path=OUT_PATH, chunksize=CHUNK_SIZE,
+               workers=1, stop_words=None):
+    if stop_words is None:
+        stop_words = load_stopwords()
+
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+
+    # Only the needed columns are parsed (drops the "Unnamed: 0" index column)
+    reader = pd.read_csv(raw_path, usecols=["label", "text"], chunksize=chunksize)
+
+    schema = pa.schema([("clean_text", pa.string()), ("severity", pa.int8())])
+    rows = 0
+    start = time.perf_counter()
 
-def map_severity(disease):
-    return severity_map.get(disease,1)  # default moderate
+    with pq.ParquetWriter(out_path, schema) as writer:
+        for result in _chunk_results(reader, stop_words, workers):
+            writer.write_table(
+                pa.Table.from_pandas(result, schema=schema, preserve_index=False)
+            )
+            rows += len(result)
 
-df["severity"] = df["label"].apply(map_severity)
+    elapsed = time.perf_counter() - start
+    return rows, elapsed
 
-final_df = df[["clean_text","severity"]]
+# -------------------------------
+# MAIN
+# -------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clean symptom text and map severity labels")
+    parser.add_argument("--input", default=RAW_PATH)
+    parser.add_argument("--output", default=OUT_PATH)
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
 
-final_df = final_df.sample(frac=1).reset_index(drop=True)
+    rows, elapsed = preprocess(args.input, args.output, args.chunksize, args.workers)
 
-final_df.to_csv(
- "data/processed/severity_dataset.csv",
- index=False
-)
+    print(f"Rows processed: {rows}")
+    print(f"Time: {elapsed:.2f}s ({rows / max(elapsed, 1e-9):,.0f} rows/sec)")
+    print(f"Saved: {args.output}")
@@ -1,7 +1,7 @@
 import pandas as pd
 from sklearn.utils import resample
 
-df = pd.read_csv("data/processed/severity_dataset.csv")
+df = pd.read_parquet("data/processed/severity_dataset.parquet")
 
 low = df[df.severity == 0]
 mod = df[df.severity == 1]
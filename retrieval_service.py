@@ -0,0 +1,305 @@
+import argparse
+import os
+import queue
+import socket
+import socketserver
+import struct
+import threading
+import time
+
+import numpy as np
+
+SOCKET_PATH = "/tmp/medai-retrieval.sock"
+
+# -------------------------------
+# Wire Protocol (little-endian)
+# -------------------------------
+# Request:  <B op><H k><I n> then
+#   EMBED / SEARCH:   n x <I len> lengths, then the utf-8 texts back to back
+#   SEARCH_VECTORS:   <I dim> then n*dim float32
+# Response: <B status><I n><I dim><I k> then
+#   vectors  n*dim float32   (EMBED, SEARCH; dim=0 for SEARCH_VECTORS)
+#   ids      n*k   int32     (SEARCH*)
+#   dists    n*k   float32   (SEARCH*)
+#   chunks   n*k   texts, same length-prefixed layout as the request
+#   status 1: n = len of a utf-8 error message that follows
+EMBED, SEARCH, SEARCH_VECTORS = 1, 2, 3
+
+REQUEST = struct.Struct("<BHI")
+RESPONSE = struct.Struct("<BIII")
+U32 = struct.Struct("<I")
+
+
+def _recv_exact(sock, n):
+    buf = bytearray(n)
+    view = memoryview(buf)
+    got = 0
+    while got < n:
+        r = sock.recv_into(view[got:])
+        if r == 0:
+            raise ConnectionError("retrieval service connection closed")
+        got += r
+    return bytes(buf)
+
+def _pack_texts(texts):
+    data = [t.encode("utf-8") for t in texts]
+    lengths = np.fromiter((len(d) for d in data), dtype="<u4", count=len(data))
+    return lengths.tobytes() + b"".join(data)
+
+def _recv_texts(sock, n):
+    lengths = np.frombuffer(_recv_exact(sock, 4 * n), dtype="<u4")
+    blob = _recv_exact(sock, int(lengths.sum()))
+    texts, pos = [], 0
+    for length in lengths.tolist():
+        texts.append(blob[pos:pos + length].decode("utf-8"))
+        pos += length
+    return texts
+
+
+# -------------------------------
+# Server
+# -------------------------------
+class _Job:
+    __slots__ = ("op", "k", "texts", "vectors", "done", "result", "error")
+
+    def __init__(self, op, k, texts=None, vectors=None):
+        self.op, self.k = op, k
+        self.texts, self.vectors = texts, vectors
+        self.done = threading.Event()
+        self.result = self.error = None
+
+
+class RetrievalService:
+    """Owns the embedder, FAISS index and chunk store for every API worker.
+
+    Requests from all connections are coalesced into one encode call and one
+    index search per batch window.
+    """
+
+    def __init__(self, engine, max_batch=64, max_wait=0.002):
+        self.engine = engine
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._jobs = queue.Queue()
+
+    def submit(self, job):
+        self._jobs.put(job)
+        job.done.wait()
+        if job.error:
+            raise job.error
+        return job.result
+
+    def _collect(self):
+        jobs = [self._jobs.get()]
+        size = len(jobs[0].texts or jobs[0].vectors)
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                job = self._jobs.get(timeout=remaining)
+            except queue.Empty:
+                break
+            jobs.append(job)
+            size += len(job.texts or job.vectors)
+        return jobs
+
+    def _search(self, jobs):
+        # One index search at the largest k, trimmed per request
+        k = max(job.k for job in jobs)
+        D, I = self.engine.index.search(np.vstack([job.vectors for job in jobs]), k)
+        pos = 0
+        for job in jobs:
+            n = len(job.vectors)
+            job.result = (D[pos:pos + n, :job.k], I[pos:pos + n, :job.k])
+            pos += n
+
+    def _isolated(self, jobs, fn):
+        # Batched call failed: redo it per job so only the bad request errors
+        for job in jobs:
+            try:
+                fn(job)
+            except Exception as e:
+                job.error = e
+
+    def _run(self, jobs):
+        # One encode for every text in the batch
+        embeds = [job for job in jobs if job.texts]
+        if embeds:
+            try:
+                encoded = self.engine.embed([t for job in embeds for t in job.texts])
+                pos = 0
+                for job in embeds:
+                    job.vectors = encoded[pos:pos + len(job.texts)]
+                    pos += len(job.texts)
+            except Exception:
+                self._isolated(embeds, lambda job: setattr(job, "vectors", self.engine.embed(job.texts)))
+
+        # Searches are grouped by vector width so a mismatched request can't break the rest
+        groups = {}
+        for job in jobs:
+            if job.op != EMBED and job.error is None and len(job.vectors):
+                groups.setdefault(job.vectors.shape[1], []).append(job)
+        for group in groups.values():
+            try:
+                self._search(group)
+            except Exception:
+                self._isolated(group, lambda job: self._search([job]))
+
+    def serve_batches(self):
+        while True:
+            jobs = self._collect()
+            try:
+                self._run(jobs)
+            except Exception as e:
+                for job in jobs:
+                    job.error = job.error or e
+            for job in jobs:
+                job.done.set()
+
+    # ---------- Connection Handling ----------
+    def handle(self, sock):
+        chunks = self.engine.chunks
+        while True:
+            try:
+                header = _recv_exact(sock, REQUEST.size)
+            except ConnectionError:
+                return
+            op, k, n = REQUEST.unpack(header)
+
+            if op not in (EMBED, SEARCH, SEARCH_VECTORS):
+                # The rest of the stream can't be parsed; report and hang up
+                message = f"unknown op {op}".encode("utf-8")
+                sock.sendall(RESPONSE.pack(1, len(message), 0, 0) + message)
+                return
+
+            try:
+                if op == SEARCH_VECTORS:
+                    (dim,) = U32.unpack(_recv_exact(sock, 4))
+                    vectors = np.frombuffer(_recv_exact(sock, 4 * n * dim), dtype="<f4").reshape(n, dim)
+                    if dim != self.engine.index.d:
+                        raise ValueError(f"vector dim {dim} does not match index dim {self.engine.index.d}")
+                    job = _Job(op, k, vectors=vectors)
+                else:
+                    job = _Job(op, k, texts=_recv_texts(sock, n))
+
+                result = self.submit(job) if n else None
+            except ConnectionError:
+                return
+            except Exception as e:
+                message = str(e).encode("utf-8")
+                sock.sendall(RESPONSE.pack(1, len(message), 0, 0) + message)
+                continue
+
+            send_vectors = op != SEARCH_VECTORS and n
+            dim = job.vectors.shape[1] if send_vectors else 0
+            k_out = k if op != EMBED else 0
+            parts = [RESPONSE.pack(0, n, dim, k_out)]
+            if send_vectors:
+                parts.append(np.ascontiguousarray(job.vectors, dtype="<f4").tobytes())
+            if op != EMBED:
+                D, I = result if result else (np.empty((0, k)), np.empty((0, k)))
+                parts.append(np.ascontiguousarray(I, dtype="<i4").tobytes())
+                parts.append(np.ascontiguousarray(D, dtype="<f4").tobytes())
+                parts.append(_pack_texts([str(chunks[i]) for i in I.ravel()]))
+            sock.sendall(b"".join(parts))
+
+
+def serve(path=SOCKET_PATH, engine=None, max_batch=64, max_wait=0.002):
+    from engine import EngineConfig, MedicalEngine, ServiceConfig
+
+    # The service itself always loads the models in-process
+    engine = engine or MedicalEngine(EngineConfig(service=ServiceConfig(socket_path=None)))
+    engine.embed_model
+    engine.index
+
+    service = RetrievalService(engine, max_batch, max_wait)
+    threading.Thread(target=service.serve_batches, daemon=True).start()
+
+    class Handler(socketserver.BaseRequestHandler):
+        def handle(self):
+            service.handle(self.request)
+
+    if os.path.exists(path):
+        os.remove(path)
+
+    with socketserver.ThreadingUnixStreamServer(path, Handler) as server:
+        server.daemon_threads = True
+        print("Retrieval service listening on", path)
+        server.serve_forever()
+
+
+# -------------------------------
+# Client
+# -------------------------------
+class RetrievalClient:
+    """Thread-safe client; each thread keeps its own persistent connection."""
+
+    def __init__(self, path=SOCKET_PATH, timeout=10.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _sock(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.path)
+            self._local.sock = sock
+        return sock
+
+    def _call(self, op, k, body, n):
+        sock = self._sock()
+        try:
+            sock.sendall(REQUEST.pack(op, k, n) + body)
+            status, n_out, dim, k_out = RESPONSE.unpack(_recv_exact(sock, RESPONSE.size))
+            if status:
+                raise RuntimeError(_recv_exact(sock, n_out).decode("utf-8"))
+
+            vectors = None
+            if dim:
+                vectors = np.frombuffer(_recv_exact(sock, 4 * n_out * dim), dtype="<f4").reshape(n_out, dim)
+            if not k_out:
+                return vectors, None, None, None
+
+            ids = np.frombuffer(_recv_exact(sock, 4 * n_out * k_out), dtype="<i4").reshape(n_out, k_out)
+            dists = np.frombuffer(_recv_exact(sock, 4 * n_out * k_out), dtype="<f4").reshape(n_out, k_out)
+            texts = _recv_texts(sock, n_out * k_out)
+            chunks = [texts[i * k_out:(i + 1) * k_out] for i in range(n_out)]
+            return vectors, ids, dists, chunks
+        except BaseException:
+            # A timeout or interrupt can leave a reply half-read; drop the connection,
+            # the next call reconnects
+            sock.close()
+            self._local.sock = None
+            raise
+
+    def embed(self, texts):
+        vectors, _, _, _ = self._call(EMBED, 0, _pack_texts(texts), len(texts))
+        return vectors if vectors is not None else np.empty((0, 0), dtype=np.float32)
+
+    def search(self, texts, k=3):
+        """Embed + search in one round trip; returns (vectors, chunks per text)."""
+        vectors, _, _, chunks = self._call(SEARCH, k, _pack_texts(texts), len(texts))
+        return vectors, chunks
+
+    def search_vectors(self, vectors, k=3):
+        vectors = np.ascontiguousarray(vectors, dtype="<f4")
+        body = U32.pack(vectors.shape[1]) + vectors.tobytes()
+        _, _, _, chunks = self._call(SEARCH_VECTORS, k, body, len(vectors))
+        return chunks
+
+
+# -------------------------------
+# MAIN
+# -------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Shared embed + FAISS search service")
+    parser.add_argument("--socket", default=SOCKET_PATH)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    serve(args.socket, max_batch=args.max_batch, max_wait=args.max_wait_ms / 1000)
@@ -0,0 +1,208 @@
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+
+from engine import SEVERITY_LABELS
+
+RULES_PATH = "data/rules/severity_rules.json"
+
+TOKEN_RE = re.compile(r"[a-z']+|[.,;:!?]")
+LIST_ITEM_TOKENS = 3      # max words in one "or"-joined list item between a cue and a phrase
+
+
+@dataclass
+class RuleMatch:
+    rule_id: str
+    severity: int
+    phrase: str
+    start: int
+    end: int
+    negated: bool
+
+
+@dataclass
+class RuleResult:
+    severity: int | None
+    matches: list
+
+    def audit(self):
+        return [asdict(m) for m in self.matches]
+
+
+# -------------------------------
+# Pattern Compilation
+# -------------------------------
+def normalize(phrase):
+    return " ".join(phrase.lower().split())
+
+def _trie_regex(phrases):
+    # Prefix-factored alternation: shared prefixes are matched once, so the
+    # cost per text position stays flat as the phrase list grows
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node):
+        is_end = "" in node
+        branches = [
+            (r"\s+" if ch == " " else re.escape(ch)) + emit(child)
+            for ch, child in sorted(node.items()) if ch
+        ]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not is_end:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if is_end else group
+
+    return emit(trie)
+
+def _validate(spec):
+    # A bad hot-reload must be rejected, not compiled into a rule set that misfires
+    if not isinstance(spec, dict) or not isinstance(spec.get("rules"), list):
+        raise ValueError("rules file must be an object with a \"rules\" list")
+    for rule in spec["rules"]:
+        if not isinstance(rule, dict) or not isinstance(rule.get("id"), str):
+            raise ValueError(f"rule without a string id: {rule!r}")
+        if type(rule.get("severity")) is not int or rule["severity"] not in SEVERITY_LABELS:
+            raise ValueError(f"rule {rule['id']}: severity must be one of {sorted(SEVERITY_LABELS)}")
+        if not isinstance(rule.get("phrases"), list):
+            raise ValueError(f"rule {rule['id']}: phrases must be a list")
+        for phrase in rule["phrases"]:
+            if not isinstance(phrase, str) or not phrase.strip():
+                raise ValueError(f"rule {rule['id']}: blank or non-string phrase {phrase!r}")
+
+    if not isinstance(spec.get("examples", []), list):
+        raise ValueError("examples must be a list")
+    for example in spec.get("examples", []):
+        if not isinstance(example, dict) or not isinstance(example.get("text"), str):
+            raise ValueError(f"example without a string text: {example!r}")
+        # severity None = no rule may fire on this text
+        severity = example.get("severity", "missing")
+        if severity is not None and (type(severity) is not int or severity not in SEVERITY_LABELS):
+            raise ValueError(f"example {example['text']!r}: severity must be null or one of {sorted(SEVERITY_LABELS)}")
+
+class CompiledRules:
+    def __init__(self, spec):
+        _validate(spec)
+
+        self.phrases = {}
+        for rule in spec["rules"]:
+            for phrase in rule["phrases"]:
+                self.phrases.setdefault(normalize(phrase), []).append(
+                    (rule["id"], rule["severity"])
+                )
+
+        negation = spec.get("negation", {})
+        self.window = negation.get("window", 8)
+        self.cues = [tuple(normalize(c).split()) for c in negation.get("cues", [])]
+        self.terminators = {normalize(t) for t in negation.get("terminators", [])}
+        self.connectors = {normalize(t) for t in negation.get("list_connectors", [])}
+        self.fillers = {normalize(t) for t in negation.get("fillers", [])}
+
+        if self.phrases:
+            self.pattern = re.compile(r"\b(?:" + _trie_regex(self.phrases) + r")\b")
+        else:
+            self.pattern = re.compile(r"(?!)")  # never matches
+
+        # Each example is a regression case the rule set must pass to be loaded
+        for example in spec.get("examples", []):
+            got = self.evaluate(example["text"]).severity
+            if got != example["severity"]:
+                raise ValueError(
+                    f"example {example['text']!r}: expected severity "
+                    f"{example['severity']}, got {got}"
+                )
+
+    def _cue_ends_at(self, tokens, end):
+        return any(tuple(tokens[end - len(cue):end]) == cue for cue in self.cues)
+
+    def is_negated(self, text, start):
+        # Look back a bounded number of characters, drop a possibly cut-off first token
+        lo = max(0, start - 20 * self.window)
+        tokens = TOKEN_RE.findall(text[lo:start])
+        if lo > 0 and tokens:
+            tokens = tokens[1:]
+        tokens = tokens[-self.window:]
+
+        # The cue must sit right before the phrase ("no chest pain", "denies any
+        # chest pain") or head the same "or"-joined list ("no fever or chest pain").
+        # Anything else in between - a comma, "and", a verb - ends the scope.
+        i = len(tokens)
+        while i and tokens[i - 1] in self.fillers:
+            i -= 1
+        while i:
+            if self._cue_ends_at(tokens, i):
+                return True
+            if tokens[i - 1] not in self.connectors:
+                return False
+            i -= 1
+
+            # Step back over one list item, looking for the cue in front of it
+            for _ in range(LIST_ITEM_TOKENS):
+                if not i or tokens[i - 1] in self.terminators or tokens[i - 1] in self.connectors:
+                    break
+                i -= 1
+                if self._cue_ends_at(tokens, i):
+                    return True
+        return False
+
+    def evaluate(self, text):
+        text = text.lower()
+        matches = []
+        for m in self.pattern.finditer(text):
+            phrase = normalize(m.group())
+            negated = self.is_negated(text, m.start())
+            for rule_id, severity in self.phrases[phrase]:
+                matches.append(RuleMatch(rule_id, severity, phrase, m.start(), m.end(), negated))
+
+        active = [m.severity for m in matches if not m.negated]
+        return RuleResult(max(active) if active else None, matches)
+
+
+# -------------------------------
+# Hot-Reloading Engine
+# -------------------------------
+class RuleEngine:
+    def __init__(self, path=RULES_PATH, reload_interval=2.0):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._checked = 0.0
+        self._rules = None
+        self.reload()
+
+    def reload(self):
+        mtime = os.path.getmtime(self.path)
+        with open(self.path, encoding="utf-8") as f:
+            rules = CompiledRules(json.load(f))
+        with self._lock:
+            self._rules, self._mtime = rules, mtime
+        return rules
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now - self._checked < self.reload_interval:
+            return
+        self._checked = now
+
+        try:
+            mtime = os.path.getmtime(self.path)
+            if mtime != self._mtime:
+                self._mtime = mtime
+                self.reload()
+                print("Severity rules reloaded:", self.path)
+        except (OSError, ValueError, KeyError, TypeError, re.error) as e:
+            # Keep serving the last good rule set until the file changes again
+            print("Severity rules reload failed:", e)
+
+    def evaluate(self, text):
+        self._maybe_reload()
+        return self._rules.evaluate(text)
@@ -0,0 +1,153 @@
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+MAX_STORED_TURNS = 6      # turns kept per session
+VERBATIM_TURNS = 2        # most recent turns sent to the LLM in full
+SUMMARY_CHARS = 160       # older answers are cut to their first sentence / this many chars
+
+
+# -------------------------------
+# Session Store
+# -------------------------------
+class SessionStore:
+    """Bounded LRU of conversation sessions with TTL eviction.
+
+    With `disk_dir` set, sessions are also written through to one JSON file
+    each, so they survive restarts and LRU eviction until their TTL runs out.
+    """
+
+    def __init__(self, max_sessions=1000, ttl=3600, disk_dir=None):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.disk_dir = disk_dir
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()
+        self._last_sweep = time.time()
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    # ---------- Disk Backend ----------
+    def _path(self, session_id):
+        return os.path.join(self.disk_dir, f"{session_id}.json")
+
+    def _write(self, session_id, session):
+        if not self.disk_dir:
+            return
+        tmp = self._path(session_id) + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(session, f)
+        os.replace(tmp, self._path(session_id))
+
+    def _read(self, session_id):
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._path(session_id), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _remove(self, session_id):
+        self._sessions.pop(session_id, None)
+        if self.disk_dir:
+            try:
+                os.remove(self._path(session_id))
+            except OSError:
+                pass
+
+    # ---------- Eviction ----------
+    def _expired(self, session, now):
+        return now - session["updated"] > self.ttl
+
+    def _evict(self, now):
+        # OrderedDict is in least-recently-used order
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if self._expired(session, now):
+                self._remove(session_id)
+            elif len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+            else:
+                break
+
+        # Sessions only on disk are never touched again once abandoned; sweep once per TTL
+        if self.disk_dir and now - self._last_sweep > self.ttl:
+            self._last_sweep = now
+            for name in os.listdir(self.disk_dir):
+                path = os.path.join(self.disk_dir, name)
+                try:
+                    if now - os.path.getmtime(path) > self.ttl:
+                        os.remove(path)
+                except OSError:
+                    pass
+
+    # ---------- Public ----------
+    def create(self, symptoms, severity_level, analysis, context):
+        session_id = uuid.uuid4().hex
+        session = {
+            "symptoms": symptoms,
+            "severity_level": severity_level,
+            "analysis": analysis,
+            "context": list(context),
+            "turns": [],
+            "updated": time.time(),
+        }
+        with self._lock:
+            self._sessions[session_id] = session
+            self._evict(session["updated"])
+            self._write(session_id, session)
+        return session_id
+
+    def get(self, session_id):
+        # IDs double as file names on the disk backend, so only accept our own format
+        if not (len(session_id) == 32 and all(c in "0123456789abcdef" for c in session_id)):
+            return None
+
+        now = time.time()
+        with self._lock:
+            session = self._sessions.get(session_id) or self._read(session_id)
+            if session is None:
+                return None
+            if self._expired(session, now):
+                self._remove(session_id)
+                return None
+            self._sessions[session_id] = session
+            self._sessions.move_to_end(session_id)
+            # A session read back from disk may push the store past max_sessions
+            self._evict(now)
+            return session
+
+    def add_turn(self, session_id, question, answer):
+        with self._lock:
+            session = self._sessions.get(session_id) or self._read(session_id)
+            if session is None:
+                return
+            self._sessions[session_id] = session
+            session["turns"] = (session["turns"] + [{"q": question, "a": answer}])[-MAX_STORED_TURNS:]
+            session["updated"] = time.time()
+            self._sessions.move_to_end(session_id)
+            self._evict(session["updated"])
+            self._write(session_id, session)
+
+
+# -------------------------------
+# Prompt History
+# -------------------------------
+def _summarize(answer):
+    first = answer.strip().split("\n")[0].split(". ")[0]
+    return first[:SUMMARY_CHARS]
+
+def format_history(turns):
+    """Older turns as one-line summaries, the latest few verbatim."""
+    lines = []
+    older, recent = turns[:-VERBATIM_TURNS], turns[-VERBATIM_TURNS:]
+    for turn in older:
+        lines.append(f"- Q: {turn['q']} | A (summary): {_summarize(turn['a'])}")
+    for turn in recent:
+        lines.append(f"User: {turn['q']}\nAssistant: {turn['a']}")
+    return "\n".join(lines)
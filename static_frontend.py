@@ -0,0 +1,99 @@
+import hashlib
+import mimetypes
+import os
+
+from fastapi import Request
+from fastapi.responses import Response
+
+DIST = "frontend/dist"
+
+# Hashed asset names change with their content, so they never need revalidation
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+mimetypes.add_type("image/webp", ".webp")
+
+
+def _accepted_encodings(header):
+    # "br;q=1.0, gzip;q=0.5, *;q=0" -> {"br": 1.0, "gzip": 0.5, "*": 0.0}
+    accepted = {}
+    for item in header.split(","):
+        token, *params = [part.strip() for part in item.split(";")]
+        if not token:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[token.lower()] = q
+    return accepted
+
+
+class _StaticFile:
+    def __init__(self, path, cache_control):
+        self.media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        self.cache_control = cache_control
+        self.variants = {}
+
+        with open(path, "rb") as f:
+            self.variants[None] = f.read()
+        for encoding, suffix in ENCODINGS:
+            if os.path.exists(path + suffix):
+                with open(path + suffix, "rb") as f:
+                    self.variants[encoding] = f.read()
+
+        self.etag = '"' + hashlib.sha256(self.variants[None]).hexdigest()[:16] + '"'
+
+    def response(self, request):
+        accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+
+        # Highest q wins, br on a tie; q=0 means the client refuses that encoding
+        encoding, best = None, 0.0
+        for e, _ in ENCODINGS:
+            q = accepted.get(e, accepted.get("*", 0.0))
+            if e in self.variants and q > best:
+                encoding, best = e, q
+
+        # Each encoding is a different representation, so it gets its own ETag
+        etag = self.etag if encoding is None else f'{self.etag[:-1]}-{encoding}"'
+        headers = {"Cache-Control": self.cache_control, "Vary": "Accept-Encoding", "ETag": etag}
+
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(self.variants[encoding], media_type=self.media_type, headers=headers)
+
+
+def mount_frontend(app, dist=DIST):
+    """Serve the built frontend (see build_frontend.py) from memory."""
+    index_path = os.path.join(dist, "index.html")
+    if not os.path.exists(index_path):
+        print(f"Frontend bundle not found at {dist}; run build_frontend.py to serve it")
+        return
+
+    index = _StaticFile(index_path, REVALIDATE)
+    assets_dir = os.path.join(dist, "assets")
+    assets = {
+        name: _StaticFile(os.path.join(assets_dir, name), IMMUTABLE)
+        for name in os.listdir(assets_dir)
+        if not name.endswith((".gz", ".br"))
+    }
+
+    @app.get("/", include_in_schema=False)
+    def frontend_index(request: Request):
+        return index.response(request)
+
+    @app.get("/assets/{name}", include_in_schema=False)
+    def frontend_asset(name: str, request: Request):
+        asset = assets.get(name)
+        if asset is None:
+            return Response(status_code=404)
+        return asset.response(request)